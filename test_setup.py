@@ -2,15 +2,16 @@
 """
 Quick test script to verify .env configuration and Roboflow connection
 """
-import os
 from pathlib import Path
 
+from upload_to_roboflow import (API_KEY, CLASS_NAMES, DATASET_PATH_STR,
+                                PROJECT_ID, SPLITS, get_project,
+                                get_workspace, parse_env, scan_dataset)
+
 
 def test_env_file():
     """Test if .env file exists and is readable"""
-    print("="*60)
-    print("TESTING ENVIRONMENT CONFIGURATION")
-    print("="*60)
+    print(f"{'='*60}\nTESTING ENVIRONMENT CONFIGURATION\n{'='*60}")
 
     env_path = Path('.env')
     if not env_path.exists():
@@ -20,13 +21,7 @@ def test_env_file():
     print("\n✓ .env file found")
 
     # Try to load manually
-    config = {}
-    with open(env_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key.strip()] = value.strip()
+    config = parse_env(env_path)
 
     required_keys = [
         'ROBOFLOW_API_KEY',
@@ -55,9 +50,7 @@ def test_env_file():
 
 def test_packages():
     """Test if required packages are installed"""
-    print("\n" + "="*60)
-    print("TESTING PACKAGE INSTALLATION")
-    print("="*60 + "\n")
+    print(f"\n{'='*60}\nTESTING PACKAGE INSTALLATION\n{'='*60}\n")
 
     packages = {
         'roboflow': 'Roboflow SDK',
@@ -78,33 +71,22 @@ def test_packages():
 
 def test_connection():
     """Test connection to Roboflow"""
-    print("\n" + "="*60)
-    print("TESTING ROBOFLOW CONNECTION")
-    print("="*60 + "\n")
+    print(f"\n{'='*60}\nTESTING ROBOFLOW CONNECTION\n{'='*60}\n")
 
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-
-        api_key = os.getenv('ROBOFLOW_API_KEY')
-        if not api_key:
+        if not API_KEY:
             print("✗ API key not found in environment")
             return False
 
-        from roboflow import Roboflow
-        rf = Roboflow(api_key=api_key)
-        workspace = rf.workspace()
+        workspace = get_workspace()
 
         print(f"✓ Successfully connected to Roboflow")
         print(f"  Workspace: {workspace.name}")
 
         # Try to access the project
-        workspace_id = os.getenv('ROBOFLOW_WORKSPACE_ID')
-        project_id = os.getenv('ROBOFLOW_PROJECT_ID')
-
-        if workspace_id and project_id:
+        if PROJECT_ID:
             try:
-                project = rf.workspace(workspace_id).project(project_id)
+                project = get_project()
                 print(f"  Project: {project.name}")
                 print(f"  Project Type: {project.type}")
                 return True
@@ -124,43 +106,29 @@ def test_connection():
 
 def test_dataset_structure():
     """Test if dataset structure is valid"""
-    print("\n" + "="*60)
-    print("TESTING DATASET STRUCTURE")
-    print("="*60 + "\n")
+    print(f"\n{'='*60}\nTESTING DATASET STRUCTURE\n{'='*60}\n")
 
-    from dotenv import load_dotenv
-    load_dotenv()
-
-    dataset_path = Path(os.getenv('DATASET_PATH', './dataset'))
-
-    if not dataset_path.exists():
-        print(f"✗ Dataset path not found: {dataset_path}")
+    try:
+        images, missing = scan_dataset(DATASET_PATH_STR)
+    except OSError:
+        print(f"✗ Dataset path not found: {DATASET_PATH_STR}")
         return False
 
-    print(f"✓ Dataset path exists: {dataset_path.absolute()}\n")
-
-    splits = ['train', 'val', 'test']
-    classes = ['WithMask', 'WithoutMask']
+    print(f"✓ Dataset path exists: {DATASET_PATH_STR}\n")
 
     total_images = 0
-    for split in splits:
-        split_path = dataset_path / split
-        if not split_path.exists():
+    for split in SPLITS:
+        if split in missing:
             print(f"  ✗ Missing {split}/ directory")
             continue
 
         print(f"  {split}/")
-        for class_name in classes:
-            class_path = split_path / class_name
-            if not class_path.exists():
+        for class_name in CLASS_NAMES:
+            if f"{split}/{class_name}" in missing:
                 print(f"    ✗ Missing {class_name}/ directory")
                 continue
 
-            images = list(class_path.glob('*.png')) + \
-                list(class_path.glob('*.jpg')) + \
-                list(class_path.glob('*.jpeg'))
-
-            count = len(images)
+            count = len(images[(split, class_name)])
             total_images += count
             print(f"    ✓ {class_name}/: {count} images")
 
@@ -170,9 +138,11 @@ def test_dataset_structure():
 
 def main():
     """Run all tests"""
-    print("\n" + "╔" + "="*58 + "╗")
-    print("║" + " "*15 + "ROBOFLOW SETUP TEST" + " "*24 + "║")
-    print("╚" + "="*58 + "╝\n")
+    print("\n".join([
+        "\n╔" + "="*58 + "╗",
+        "║" + " "*15 + "ROBOFLOW SETUP TEST" + " "*24 + "║",
+        "╚" + "="*58 + "╝\n"
+    ]))
 
     results = {
         'Environment Configuration': test_env_file(),
@@ -181,28 +151,28 @@ def main():
         'Roboflow Connection': test_connection()
     }
 
-    print("\n" + "="*60)
-    print("TEST SUMMARY")
-    print("="*60)
+    all_passed = all(results.values())
 
+    # Build the whole summary and print it in one call
+    lines = ["\n" + "="*60, "TEST SUMMARY", "="*60]
     for test_name, passed in results.items():
         status = "✓ PASS" if passed else "✗ FAIL"
-        print(f"  {status}: {test_name}")
+        lines.append(f"  {status}: {test_name}")
 
-    all_passed = all(results.values())
-
-    print("\n" + "="*60)
+    lines.append("\n" + "="*60)
     if all_passed:
-        print("✓ ALL TESTS PASSED!")
-        print("You're ready to upload your dataset!")
-        print("\nRun: python upload_to_roboflow.py")
+        lines.append("✓ ALL TESTS PASSED!")
+        lines.append("You're ready to upload your dataset!")
+        lines.append("\nRun: python upload_to_roboflow.py")
     else:
-        print("✗ SOME TESTS FAILED")
-        print("Please fix the issues above before uploading.")
+        lines.append("✗ SOME TESTS FAILED")
+        lines.append("Please fix the issues above before uploading.")
 
         if not results['Package Installation']:
-            print("\nTo fix: pip install -r requirements.txt")
-    print("="*60 + "\n")
+            lines.append("\nTo fix: pip install -r requirements.txt")
+    lines.append("="*60 + "\n")
+
+    print("\n".join(lines))
 
     return all_passed
 
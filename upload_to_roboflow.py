@@ -2,9 +2,22 @@
 """
 Script to upload Face Mask Detection dataset to Roboflow
 """
+import argparse
+import io
+import json
+import mimetypes
+import multiprocessing
 import os
+import queue
+import re
+import signal
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache, partial
 from pathlib import Path
 
 # Load environment variables
@@ -16,6 +29,18 @@ except ImportError:
     DOTENV_AVAILABLE = False
     print("Note: python-dotenv not installed. Will try to read .env manually.")
 
+# KEY=value lines; comments and blank lines never match
+_ENV_RE = re.compile(
+    rb'(?m)^[ \t]*([A-Za-z_]\w*)[ \t]*=[ \t]*"?(.*?)"?[ \t]*\r?$')
+
+
+@lru_cache(maxsize=None)
+def parse_env(path):
+    """Parse a .env file into a dict, reading it only once per path"""
+    data = Path(path).read_bytes()
+    return {m[1].decode(): m[2].decode() for m in _ENV_RE.finditer(data)}
+
+
 # Load configuration from environment variables
 
 
@@ -25,12 +50,11 @@ def load_config():
     if not DOTENV_AVAILABLE:
         env_path = Path('.env')
         if env_path.exists():
-            with open(env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        os.environ[key.strip()] = value.strip()
+            for key, value in parse_env(env_path).items():
+                # Like python-dotenv, never override the real environment
+                if key in os.environ:
+                    continue
+                os.environ[key] = value
 
     config = {
         'api_key': os.getenv('ROBOFLOW_API_KEY'),
@@ -47,23 +71,91 @@ def load_config():
 config = load_config()
 WORKSPACE_ID = config['workspace_id']
 PROJECT_ID = config['project_id']
-DATASET_PATH = config['dataset_path']
+# Resolved once; DATASET_PATH_STR serves APIs that take plain strings
+DATASET_PATH = Path(config['dataset_path']).resolve()
+DATASET_PATH_STR = str(DATASET_PATH)
 API_KEY = config['api_key']
 
 # Dataset info
+SPLITS = ['train', 'val', 'test']
 CLASS_NAMES = ['WithMask', 'WithoutMask']
 
+# Upload settings
+UPLOAD_URL = "https://api.roboflow.com/dataset/{project}/upload"
+DEFAULT_WORKERS = 16
+DEFAULT_BATCH_SIZE = 1
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+JPEG_QUALITY = 85
+UPLOAD_CACHE_FILE = '.roboflow_uploads.json'
+CACHE_SAVE_INTERVAL = 100
+IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg'})
+
+
+def list_images(class_path):
+    """Return os.DirEntry objects for all images in a class directory
+
+    Entries keep the path from the single scan. Their stat() is a real
+    syscall on first use (the upload cache's _cache_key()) and cached after.
+    """
+    images = []
+    with os.scandir(class_path) as entries:
+        for entry in entries:
+            # One set lookup on the extension; names like '.png' are skipped
+            name = entry.name
+            dot = name.rfind('.')
+            if (dot > 0 and name[dot + 1:].lower() in IMAGE_EXTENSIONS
+                    and entry.is_file(follow_symlinks=False)):
+                images.append(entry)
+    return images
+
+
+def scan_dataset(dataset_path):
+    """Walk the dataset tree once, collecting images per split and class
+
+    Only split and class directories are entered; anything else in the
+    tree is pruned before it is read.
+
+    Returns a dict mapping (split, class_name) to image entries, and the set
+    of expected directories (e.g. 'train' or 'train/WithMask') not found.
+    Raises OSError if the dataset directory itself cannot be listed.
+    """
+    expected = {(split, class_name)
+                for split in SPLITS for class_name in CLASS_NAMES}
+    top = os.fspath(dataset_path)
+    seen_splits = set()
+    found = {}
+
+    def raise_for_root(error):
+        # Listing the root doubles as its existence check
+        if error.filename == top:
+            raise error
+
+    # Prune the walk in place: splits at the top, classes below them
+    for root, dirs, _ in os.walk(top, onerror=raise_for_root, followlinks=True):
+        if root == top:
+            dirs[:] = [d for d in dirs if d in SPLITS]
+            seen_splits.update(dirs)
+            continue
 
-def check_roboflow_installed():
-    """Check if roboflow CLI is installed"""
-    try:
-        result = subprocess.run(['roboflow', '--version'],
-                                capture_output=True, text=True)
-        print(f"✓ Roboflow CLI is installed: {result.stdout.strip()}")
-        return True
-    except FileNotFoundError:
-        print("✗ Roboflow CLI is not installed")
-        return False
+        split = os.path.basename(root)
+        for class_name in dirs:
+            if class_name in CLASS_NAMES:
+                found[(split, class_name)] = list_images(
+                    os.path.join(root, class_name))
+
+        # Class directories were just scanned; never walk into them
+        dirs[:] = []
+
+    missing = {split for split in SPLITS if split not in seen_splits}
+    missing.update(f"{split}/{class_name}" for split, class_name in expected
+                   if split in seen_splits and (split, class_name) not in found)
+
+    # Report in a stable split/class order rather than directory order
+    images = {(split, class_name): found[(split, class_name)]
+              for split in SPLITS for class_name in CLASS_NAMES
+              if (split, class_name) in found}
+    return images, missing
 
 
 def install_roboflow():
@@ -79,87 +171,94 @@ def install_roboflow():
         return False
 
 
-def check_authentication():
-    """Check if user is authenticated with Roboflow using API key"""
-    print("\nChecking Roboflow authentication...")
+@lru_cache(maxsize=1)
+def _roboflow_class():
+    """Import the Roboflow client class on first use only"""
+    from roboflow import Roboflow
+    return Roboflow
 
-    if not API_KEY:
-        print("✗ No API key found in .env file")
-        return False
 
-    try:
-        # Set the API key in the environment
-        os.environ['ROBOFLOW_API_KEY'] = API_KEY
+@lru_cache(maxsize=1)
+def _multipart_encoder_class():
+    """Import MultipartEncoder on first use instead of once per upload"""
+    from requests_toolbelt import MultipartEncoder
+    return MultipartEncoder
+
+
+@lru_cache(maxsize=1)
+def get_roboflow():
+    """Return the Roboflow client, authenticating only once per run"""
+    Roboflow = _roboflow_class()
+    return Roboflow(api_key=API_KEY)
+
+
+@lru_cache(maxsize=1)
+def get_workspace():
+    """Return the configured Roboflow workspace"""
+    return get_roboflow().workspace(WORKSPACE_ID)
 
-        # Try to authenticate using Python API
-        from roboflow import Roboflow
-        rf = Roboflow(api_key=API_KEY)
-        workspace = rf.workspace()
-        print(f"✓ Authenticated with Roboflow as: {workspace.name}")
-        return True
-    except ImportError:
-        print("✗ Roboflow Python package not found")
-        return False
-    except Exception as e:
-        print(f"✗ Authentication failed: {e}")
-        return False
 
+@lru_cache(maxsize=1)
+def get_project():
+    """Return the configured Roboflow project"""
+    return get_workspace().project(PROJECT_ID)
 
-def authenticate_roboflow():
-    """Authenticate with Roboflow using API key from .env"""
-    print("\nAuthenticating with Roboflow using API key...")
+
+@lru_cache(maxsize=1)
+def _ensure_workspace():
+    """Authenticate with Roboflow once and return the workspace, or None"""
+    print("\nChecking Roboflow authentication...")
 
     if not API_KEY:
         print("✗ No API key found in .env file")
         print("Please add ROBOFLOW_API_KEY to your .env file")
-        return False
+        return None
 
     try:
-        # Set environment variable for roboflow CLI
+        # Set the API key in the environment
         os.environ['ROBOFLOW_API_KEY'] = API_KEY
 
-        # Test authentication with Python API
-        from roboflow import Roboflow
-        rf = Roboflow(api_key=API_KEY)
-        workspace = rf.workspace()
-        print(f"✓ Authentication successful: {workspace.name}")
-        return True
+        workspace = get_workspace()
+        print(f"✓ Authenticated with Roboflow as: {workspace.name}")
+        return workspace
     except ImportError:
         print("✗ Roboflow Python package not found")
         print("Please install it: pip install roboflow")
-        return False
+        return None
     except Exception as e:
         print(f"✗ Authentication failed: {e}")
-        return False
+        return None
 
 
-def create_data_yaml():
-    """Create data.yaml file for the dataset"""
+def create_data_yaml(manifest):
+    """Create data.yaml file for the dataset from the verified image manifest"""
     print("\nCreating data.yaml file...")
 
-    dataset_path = Path(DATASET_PATH)
-    yaml_content = f"""# Face Mask Detection Dataset
-# Single-Label Classification
-
-# Dataset paths
-path: {dataset_path.absolute()}
-train: train
-val: val
-test: test
-
-# Classes
-nc: {len(CLASS_NAMES)}
-names: {CLASS_NAMES}
-
-# Dataset info
-dataset_type: classification
-"""
+    data = {
+        'path': DATASET_PATH_STR,
+        'train': 'train',
+        'val': 'val',
+        'test': 'test',
+        'nc': len(CLASS_NAMES),
+        'names': CLASS_NAMES,
+        'dataset_type': 'classification'
+    }
+    counts = "".join(f"#   {split}/{class_name}: {len(images)}\n"
+                     for (split, class_name), images in manifest.items())
 
-    yaml_path = dataset_path / "data.yaml"
+    yaml_path = os.path.join(DATASET_PATH_STR, "data.yaml")
 
     try:
-        with open(yaml_path, 'w') as f:
-            f.write(yaml_content)
+        import yaml
+
+        # Write beside the target and rename, so data.yaml is never partial
+        tmp_path = yaml_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write("# Face Mask Detection Dataset\n"
+                    "# Single-Label Classification\n\n")
+            yaml.safe_dump(data, f, sort_keys=False)
+            f.write("\n# Image counts\n" + counts)
+        os.replace(tmp_path, yaml_path)
         print(f"✓ Created data.yaml at: {yaml_path}")
         return True
     except Exception as e:
@@ -168,129 +267,434 @@ dataset_type: classification
 
 
 def verify_dataset_structure():
-    """Verify that the dataset has the correct structure"""
+    """Verify the dataset structure and return its image manifest
+
+    The manifest maps (split, class_name) to image entries and is None when
+    the structure is invalid.
+    """
     print("\nVerifying dataset structure...")
 
-    dataset_path = Path(DATASET_PATH)
-    splits = ['train', 'test', 'val']
+    try:
+        images, missing = scan_dataset(DATASET_PATH_STR)
+    except OSError as e:
+        print(f"\n✗ Cannot read dataset directory: {e}")
+        return None
 
     issues = []
 
-    for split in splits:
-        split_path = dataset_path / split
-        if not split_path.exists():
+    for split in SPLITS:
+        if split in missing:
             issues.append(f"Missing {split} directory")
             continue
 
         for class_name in CLASS_NAMES:
-            class_path = split_path / class_name
-            if not class_path.exists():
+            if f"{split}/{class_name}" in missing:
                 issues.append(f"Missing {split}/{class_name} directory")
             else:
                 # Count images
-                images = list(class_path.glob('*.png')) + \
-                    list(class_path.glob('*.jpg')) + \
-                    list(class_path.glob('*.jpeg'))
-                print(f"  {split}/{class_name}: {len(images)} images")
+                count = len(images[(split, class_name)])
+                print(f"  {split}/{class_name}: {count} images")
 
     if issues:
         print("\n✗ Dataset structure issues found:")
         for issue in issues:
             print(f"  - {issue}")
-        return False
+        return None
     else:
         print("✓ Dataset structure is valid")
-        return True
+        return images
 
 
-def upload_dataset():
-    """Upload the dataset to Roboflow using Python API"""
-    print("\n" + "="*60)
-    print("UPLOADING DATASET TO ROBOFLOW")
-    print("="*60)
+def create_session(pool_size=DEFAULT_WORKERS):
+    """Create an HTTP session that reuses connections across uploads
+
+    pool_size should match the number of concurrent uploads; urllib3
+    discards connections beyond it, paying a new handshake each time.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 
-    dataset_path = Path(DATASET_PATH).absolute()
+    # Only retry failed connects here: a streamed upload body cannot be
+    # rewound, so _upload_one() retries error responses itself
+    retry = Retry(connect=MAX_RETRIES, read=0, status=0, backoff_factor=0.5)
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
 
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+
+def _multipart(image_name, f):
+    """Wrap an open image in a streaming multipart/form-data body"""
+    MultipartEncoder = _multipart_encoder_class()
+    mime_type = mimetypes.guess_type(image_name)[0] or 'application/octet-stream'
+    return MultipartEncoder(fields={'file': (image_name, f, mime_type)})
+
+
+def _ignore_sigint():
+    """Leave Ctrl-C to the parent, which stops the upload cleanly"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _reencode_jpeg(image_path, original_size):
+    """Re-encode an image as JPEG, returning the bytes only if smaller
+
+    Runs in a worker process so encoding does not hold up the uploads.
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        buf = io.BytesIO()
+        img.save(buf, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+
+    data = buf.getvalue()
+    return data if len(data) < original_size else None
+
+
+def _prepare_upload(image, encoder_pool=None):
+    """Open an image and build its upload body
+
+    With an encoder_pool, PNGs are recompressed to JPEG in that pool and
+    the smaller JPEG bytes are uploaded in place of the file.
+    """
+    image_name = image.name
+    if encoder_pool is not None and image_name.lower().endswith('.png'):
+        # _cache_key() already stat()ed this entry, so the size is cached
+        data = encoder_pool.submit(_reencode_jpeg, image.path,
+                                   image.stat().st_size).result()
+        if data is not None:
+            image_name = os.path.splitext(image_name)[0] + '.jpg'
+            f = io.BytesIO(data)
+            return image_name, f, _multipart(image_name, f)
+
+    f = open(image.path, 'rb')
+    return image_name, f, _multipart(image_name, f)
+
+
+def _upload_one(session, prepared, split, class_name):
+    """Stream a prepared image to the Roboflow project and close its file"""
+    image_name, f, body = prepared
+
+    with f:
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                # The previous body was consumed; start again from the top
+                f.seek(0)
+                body = _multipart(image_name, f)
+
+            response = session.post(
+                UPLOAD_URL.format(project=PROJECT_ID),
+                params={
+                    'api_key': API_KEY,
+                    'name': image_name,
+                    'split': split,
+                    'tag': class_name
+                },
+                data=body,
+                headers={'Content-Type': body.content_type},
+                timeout=(30, 300)
+            )
+
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            time.sleep(0.5 * 2 ** attempt)
+
+    response.raise_for_status()
+
+    result = response.json()
+    if not result.get('success') and not result.get('duplicate'):
+        raise RuntimeError(result.get('error', result))
+    return result
+
+
+def _prefetch(prepare, items, stop=None, depth=2):
+    """Yield (item, prepared, error) while the next items are prepared
+
+    A background thread runs prepare() up to depth items ahead, so file
+    opens overlap with the request in flight. It stops early once the
+    optional stop event is set. Consumers must exhaust the generator so
+    the producer is never left blocked.
+    """
+    ready = queue.Queue(maxsize=depth)
+
+    def produce():
+        try:
+            for item in items:
+                if stop is not None and stop.is_set():
+                    break
+                try:
+                    ready.put((item, prepare(item), None))
+                except Exception as e:
+                    ready.put((item, None, e))
+        finally:
+            # Always end the stream, even if prepare() raised BaseException
+            ready.put(None)
+
+    threading.Thread(target=produce, daemon=True).start()
+    yield from iter(ready.get, None)
+
+
+def _upload_batch(session, batch, split, class_name, results, stop,
+                  encoder_pool=None):
+    """Upload a batch of images, reporting each one on the results queue
+
+    Puts (image, upload_id, error) for every image as soon as it is done,
+    then None once the whole batch has finished. Images still pending when
+    the stop event is set are skipped without being reported.
+    """
     try:
-        from roboflow import Roboflow
+        prepare = partial(_prepare_upload, encoder_pool=encoder_pool)
+        for image, prepared, error in _prefetch(prepare, batch, stop):
+            if stop.is_set():
+                # Keep draining so the prefetch thread is not left blocked
+                if prepared is not None:
+                    prepared[1].close()
+                continue
+
+            upload_id = None
+            if error is None:
+                try:
+                    upload_id = _upload_one(
+                        session, prepared, split, class_name).get('id')
+                except Exception as e:
+                    error = e
+            results.put((image, upload_id, error))
+    finally:
+        results.put(None)
+
+
+def _cache_key(image):
+    """Identify an image file by path, modification time and size"""
+    stat = image.stat()
+    return f"{image.path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_upload_cache(cache_path):
+    """Load the record of images already uploaded, keyed by project"""
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_upload_cache(cache_path, cache):
+    """Write the upload record atomically so a crash never truncates it"""
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+class UploadBatcher:
+    """Group images into batches that run as single thread pool tasks
+
+    The Roboflow upload endpoint takes one image per request, so a batch is
+    posted image by image over one pooled connection. Batching saves no
+    round-trips; it only keeps the number of queued tasks small. It also
+    caps concurrency at the number of batches, so the default is one image
+    per task.
+    """
+
+    def __init__(self, executor, session, batch_size=DEFAULT_BATCH_SIZE,
+                 encoder_pool=None):
+        self.executor = executor
+        self.session = session
+        self.batch_size = batch_size
+        self.encoder_pool = encoder_pool
+        self.results = queue.Queue()
+        self.stop = threading.Event()
+        self.futures = []
+        self._buffers = {}
+
+    def add(self, image, split, class_name):
+        """Queue an image, submitting its batch once it is full"""
+        buffer = self._buffers.setdefault((split, class_name), [])
+        buffer.append(image)
+        if len(buffer) >= self.batch_size:
+            self._flush(split, class_name)
+
+    def flush(self):
+        """Submit all partially filled batches"""
+        for split, class_name in list(self._buffers):
+            self._flush(split, class_name)
+
+    def abort(self):
+        """Cancel queued batches and wait for the running ones to stop"""
+        self.stop.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _flush(self, split, class_name):
+        batch = self._buffers.pop((split, class_name), None)
+        if batch:
+            self.futures.append(self.executor.submit(
+                _upload_batch, self.session, batch, split, class_name,
+                self.results, self.stop, self.encoder_pool))
+
+
+def upload_dataset(manifest, workers=DEFAULT_WORKERS,
+                   batch_size=DEFAULT_BATCH_SIZE, recompress=False):
+    """Upload the images listed in the manifest to Roboflow"""
+    print(f"\n{'='*60}\nUPLOADING DATASET TO ROBOFLOW\n{'='*60}")
 
-        # Initialize Roboflow with API key
-        rf = Roboflow(api_key=API_KEY)
-        workspace = rf.workspace(WORKSPACE_ID)
-        project = workspace.project(PROJECT_ID)
+    try:
+        from tqdm import tqdm
 
-        print(f"\nProject: {project.name}")
-        print(f"Workspace: {workspace.name}")
-        print(f"Dataset path: {dataset_path}")
-        print("\nUploading images...")
-        print("This may take a while depending on your dataset size...")
-        print("Please be patient.\n")
+        # Reuse the workspace authenticated in main()
+        workspace = _ensure_workspace()
+        if workspace is None:
+            return False
+        project = get_project()
+
+        print("\n".join([
+            f"\nProject: {project.name}",
+            f"Workspace: {workspace.name}",
+            f"Dataset path: {DATASET_PATH_STR}",
+            f"\nUploading images with {workers} parallel workers...",
+            "This may take a while depending on your dataset size...",
+            "Please be patient.\n"
+        ]))
+
+        # Skip images uploaded to this project by a previous run
+        cache_path = os.path.join(DATASET_PATH_STR, UPLOAD_CACHE_FILE)
+        upload_cache = load_upload_cache(cache_path)
+        uploaded_ids = upload_cache.setdefault(PROJECT_ID, {})
 
         # Upload images for each split
-        splits = ['train', 'val', 'test']
+        total_images = 0
+        total_skipped = 0
         total_uploaded = 0
-
-        for split in splits:
-            print(f"\n{'='*50}")
-            print(f"Uploading {split} split...")
-            print(f"{'='*50}")
-
-            for class_name in CLASS_NAMES:
-                class_path = dataset_path / split / class_name
-                if not class_path.exists():
-                    print(
-                        f"  Skipping {split}/{class_name} - directory not found")
-                    continue
-
-                # Get all images
-                images = list(class_path.glob('*.png')) + \
-                    list(class_path.glob('*.jpg')) + \
-                    list(class_path.glob('*.jpeg'))
-
-                print(
-                    f"\n  Uploading {len(images)} images from {split}/{class_name}...")
-
-                for idx, image_path in enumerate(images, 1):
+        unsaved = 0
+
+        session = create_session(pool_size=workers)
+        # PNG re-encoding is CPU bound, so it gets its own process pool.
+        # Workers are spawned, not forked: the pool starts them from the
+        # prefetch threads while other threads are mid-request. Ctrl-C
+        # reaches the whole process group, so workers ignore it
+        encoders = (ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_ignore_sigint)
+            if recompress else nullcontext())
+        with session, encoders as encoder_pool, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            batcher = UploadBatcher(executor, session, batch_size, encoder_pool)
+
+            try:
+                for (split, class_name), images in manifest.items():
+                    pending = []
+                    skipped = 0
+                    for image in images:
+                        try:
+                            if _cache_key(image) in uploaded_ids:
+                                skipped += 1
+                                continue
+                        except OSError as e:
+                            # Moved or deleted since the dataset was verified
+                            print(f"    ✗ Failed to read {image.name}: {e}")
+                            continue
+                        pending.append(image)
+
+                    total_images += len(pending)
+                    total_skipped += skipped
+                    print(f"  Queueing {len(pending)} images from {split}/{class_name}"
+                          f" ({skipped} already uploaded)")
+
+                    # Upload image with tag for the class
+                    for image in pending:
+                        batcher.add(image, split, class_name)
+                batcher.flush()
+
+                print()
+                with tqdm(total=total_images, unit='img', desc="Uploading") as progress:
+                    # Workers report every image; None marks a finished batch
+                    running = len(batcher.futures)
+                    while running:
+                        result = batcher.results.get()
+                        if result is None:
+                            running -= 1
+                            continue
+
+                        image, upload_id, error = result
+                        if error is not None:
+                            progress.write(
+                                f"    ✗ Failed to upload {image.name}: {error}")
+                        else:
+                            uploaded_ids[_cache_key(image)] = upload_id
+                            total_uploaded += 1
+                            unsaved += 1
+                            if unsaved >= CACHE_SAVE_INTERVAL:
+                                save_upload_cache(cache_path, upload_cache)
+                                unsaved = 0
+
+                        progress.update(1)
+            except BaseException:
+                # Ctrl-C or a failed save: stop instead of letting the
+                # executor finish every queued batch on exit
+                batcher.abort()
+                while True:
                     try:
-                        # Upload image with tag for the class
-                        project.upload(
-                            image_path=str(image_path),
-                            split=split,
-                            tag_names=[class_name]
-                        )
-                        total_uploaded += 1
-
-                        # Print progress every 10 images
-                        if idx % 10 == 0 or idx == len(images):
-                            print(
-                                f"    Progress: {idx}/{len(images)} images uploaded")
-
-                    except Exception as e:
-                        print(f"    ✗ Failed to upload {image_path.name}: {e}")
-
-        print("\n" + "="*60)
-        print(f"✓ UPLOAD COMPLETE!")
-        print(f"  Total images uploaded: {total_uploaded}")
-        print("="*60)
+                        result = batcher.results.get_nowait()
+                    except queue.Empty:
+                        break
+                    if result is not None and result[2] is None:
+                        image, upload_id, _ = result
+                        uploaded_ids[_cache_key(image)] = upload_id
+                raise
+            finally:
+                # Runs only once no worker can still be uploading
+                save_upload_cache(cache_path, upload_cache)
+
+        print("\n".join([
+            "\n" + "="*60,
+            "✓ UPLOAD COMPLETE!",
+            f"  Total images uploaded: {total_uploaded}",
+            f"  Skipped (already uploaded): {total_skipped}",
+            "="*60
+        ]))
         return True
 
-    except ImportError:
-        print("✗ Roboflow Python package not found")
-        print("Please install it: pip install roboflow")
+    except ImportError as e:
+        print(f"✗ Missing package: {e}")
+        print("Please install it: pip install -r requirements.txt")
         return False
     except Exception as e:
-        print("\n" + "="*60)
-        print(f"✗ UPLOAD FAILED: {e}")
-        print("="*60)
+        print(f"\n{'='*60}\n✗ UPLOAD FAILED: {e}\n{'='*60}")
         return False
 
 
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(
+        description="Upload the Face Mask Detection dataset to Roboflow")
+    parser.add_argument('--workers', type=positive_int, default=DEFAULT_WORKERS,
+                        help="number of concurrent uploads (default: %(default)s)")
+    parser.add_argument('--batch-size', type=positive_int, default=DEFAULT_BATCH_SIZE,
+                        help="images per upload task; values above 1 save "
+                             "no requests and lower parallelism "
+                             "(default: %(default)s)")
+    parser.add_argument('--recompress', action='store_true',
+                        help=f"re-encode PNGs as quality-{JPEG_QUALITY} JPEGs "
+                             "before upload when that makes them smaller")
+    return parser.parse_args()
+
+
 def main():
     """Main function to orchestrate the upload process"""
-    print("="*60)
-    print("ROBOFLOW DATASET UPLOAD SCRIPT")
-    print("Face Mask Detection Dataset")
-    print("="*60)
+    args = parse_args()
+
+    print(f"{'='*60}\nROBOFLOW DATASET UPLOAD SCRIPT\n"
+          f"Face Mask Detection Dataset\n{'='*60}")
 
     # Step 0: Validate configuration
     if not API_KEY:
@@ -309,7 +713,7 @@ def main():
     # Step 1: Check if roboflow is installed
     try:
         import roboflow
-        print(f"✓ Roboflow package is installed")
+        print(f"✓ Roboflow {roboflow.__version__} is installed")
     except ImportError:
         print("✗ Roboflow package is not installed")
         response = input("\nWould you like to install roboflow now? (y/n): ")
@@ -323,24 +727,27 @@ def main():
             return False
 
     # Step 2: Verify dataset structure
-    if not verify_dataset_structure():
+    manifest = verify_dataset_structure()
+    if manifest is None:
         print("\nPlease fix the dataset structure before uploading.")
         return False
 
     # Step 3: Create data.yaml
-    if not create_data_yaml():
+    if not create_data_yaml(manifest):
         return False
 
     # Step 4: Check authentication
-    if not check_authentication():
+    if _ensure_workspace() is None:
         print("\n✗ Authentication failed. Please check your API key in .env file")
         return False
 
     # Step 5: Confirm upload
-    print(f"\nReady to upload dataset to:")
-    print(f"  Workspace: {WORKSPACE_ID}")
-    print(f"  Project: {PROJECT_ID}")
-    print(f"  Dataset path: {Path(DATASET_PATH).absolute()}")
+    print("\n".join([
+        "\nReady to upload dataset to:",
+        f"  Workspace: {WORKSPACE_ID}",
+        f"  Project: {PROJECT_ID}",
+        f"  Dataset path: {DATASET_PATH_STR}"
+    ]))
 
     response = input("\nProceed with upload? (y/n): ")
     if response.lower() != 'y':
@@ -348,7 +755,9 @@ def main():
         return False
 
     # Step 6: Upload
-    return upload_dataset()
+    return upload_dataset(manifest, workers=args.workers,
+                          batch_size=args.batch_size,
+                          recompress=args.recompress)
 
 
 if __name__ == "__main__":